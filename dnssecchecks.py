@@ -249,9 +249,9 @@ def verify_signatures(logger, fqdn, rec_dict, result_dict, stats_dict, rrset, ve
 
 	valid_algorithms = set()
 
-	for rrsig in rrset_sigs:
-		succ, reason = dnssecfn.verify_sig(logger, rrset_rrs, dnskeys, rrsig)
+	verify_results = dnssecfn.verify_sigs(logger, rrset_rrs, dnssecfn.index_dnskeys(dnskeys), rrset_sigs)
 
+	for rrsig, (succ, reason) in zip(rrset_sigs, verify_results):
 		if succ:
 			valid_algorithms.add(rrsig.algorithm)
 
@@ -9,16 +9,11 @@
 import oidnstypes
 import hashlib
 import functools
-from Crypto.PublicKey import RSA		#--+
-from Crypto.Signature import PKCS1_v1_5		#  |
-import Crypto.Hash				#  |-> for RSA validation
-import Crypto.Hash.SHA				#  |
-import Crypto.Hash.SHA256			#  |
-import Crypto.Hash.SHA512			#--+
-import ecdsa					#----> for ECDSA validation
-import nacl.encoding				#--+-> for Ed25519 validation
-import nacl.signing				#--+
-import eddsa_rfc8032				#----> for Ed448 validation
+from cryptography.exceptions import InvalidSignature			#--+
+from cryptography.hazmat.primitives import hashes			#  |-> for RSA, ECDSA
+from cryptography.hazmat.primitives.asymmetric import ec, padding, rsa	#  |   and EdDSA
+from cryptography.hazmat.primitives.asymmetric import ed25519, ed448	#  |   validation
+from cryptography.hazmat.primitives.asymmetric import utils		#--+
 
 ##
 # Configuration
@@ -29,22 +24,26 @@ import eddsa_rfc8032				#----> for Ed448 validation
 signature_grace_time = 7200
 
 ##
-# Convert a domain name to a binary-encoded owner name
+# Convert a domain name to a binary-encoded owner name;
+# the same names (e.g. signer names) occur over and over
+# again in a data set, so conversion results are cached
 ##
+
+@functools.lru_cache(maxsize=65536)
 def str_to_owner(name):
-	owner_name = bytes()
+	owner_name = []
 
 	name = name.lower().replace('\\.','\\\\')
 
 	for label in name.split('.'):
 		if len(label) > 0:
 			label = label.replace('\\\\','.')
-			owner_name += bytes.fromhex('%02X' % len(label))
-			owner_name += bytes(label, "utf8")
+			owner_name.append(bytes((len(label),)))
+			owner_name.append(bytes(label, "utf8"))
 
-	owner_name += b'\0'
+	owner_name.append(b'\0')
 
-	return owner_name
+	return b''.join(owner_name)
 
 ##
 # Compute a DS for the specified DNSKEY record
@@ -54,16 +53,156 @@ def compute_ds(hash_obj, dnskey):
 	if type(dnskey) is not oidnstypes.OI_DNSKEY_rec:
 		raise Exception("Cannot compute a DS for something that is not a DNSKEY")
 
-	hash_obj.update(str_to_owner(dnskey.fqdn))
-	hash_obj.update(dnskey.towire())
+	hash_obj.update(dnskey.canonical_owner())
+	hash_obj.update(dnskey.canonical_rdata())
 	return hash_obj.digest()
 
+##
+# Convert an RRset to canonical wire format (RFC 4034,
+# section 6.3), using the specified original TTL
+##
+
+def rrset_to_wire(rrset, original_ttl):
+	ttl_wire = original_ttl.to_bytes(4, 'big')
+	rdatas = [ rec.canonical_rdata() for rec in rrset ]
+
+	# Canonically order the RRset on the RDATA only; there
+	# is nothing to sort for single-record RRsets
+	order = range(0, len(rrset))
+
+	if len(rrset) > 1:
+		order = sorted(order, key=rdatas.__getitem__)
+
+	wire_chunks = []
+
+	for i in order:
+		rec = rrset[i]
+		wire_chunks.extend((rec.canonical_prefix(), ttl_wire, rec.canonical_rdlength(), rdatas[i]))
+
+	return b''.join(wire_chunks)
+
+##
+# Return the digest of the signature verification data
+# (supplied as a list of chunks that are streamed into the
+# hash) for the specified hash algorithm; digests are
+# stored in the supplied dictionary so that signature
+# verification data is hashed only once per hash algorithm
+##
+
+def sig_input_digest(digests, hash_alg, sig_input_chunks):
+	if hash_alg.name not in digests:
+		hash_fn = hashlib.new(hash_alg.name)
+
+		for chunk in sig_input_chunks:
+			hash_fn.update(chunk)
+
+		digests[hash_alg.name] = hash_fn.digest()
+
+	return digests[hash_alg.name]
+
+##
+# Signature verification functions for each family of
+# algorithms; these return True if the signature validates
+# with the supplied DNSKEY and False if it does not. The
+# public key is constructed only once per DNSKEY.
+##
+
+def verify_rsa(hash_alg, key, signature, sig_input_chunks, digests):
+	if key.pubkey is None:
+		key.pubkey = rsa.RSAPublicNumbers(key.rsa_e_int, key.rsa_n_int).public_key()
+
+	digest = sig_input_digest(digests, hash_alg, sig_input_chunks)
+
+	try:
+		key.pubkey.verify(signature, digest, padding.PKCS1v15(), utils.Prehashed(hash_alg))
+	except InvalidSignature:
+		return False
+
+	return True
+
+def verify_ecdsa(curve, hash_alg, rs_len, key, signature, sig_input_chunks, digests):
+	if key.pubkey is None:
+		key.pubkey = ec.EllipticCurvePublicKey.from_encoded_point(curve, b'\x04' + key.wire)
+
+	# DNSSEC ECDSA signatures are encoded as r|s (RFC 6605),
+	# OpenSSL expects DER encoding
+	if len(signature) != 2 * rs_len:
+		return False
+
+	r = int.from_bytes(signature[:rs_len], 'big')
+	s = int.from_bytes(signature[rs_len:], 'big')
+
+	digest = sig_input_digest(digests, hash_alg, sig_input_chunks)
+
+	try:
+		key.pubkey.verify(utils.encode_dss_signature(r, s), digest, ec.ECDSA(utils.Prehashed(hash_alg)))
+	except InvalidSignature:
+		return False
+
+	return True
+
+def verify_ed25519(key, signature, sig_input_chunks, digests):
+	if key.pubkey is None:
+		key.pubkey = ed25519.Ed25519PublicKey.from_public_bytes(key.eddsa_a)
+
+	try:
+		key.pubkey.verify(signature, b''.join(sig_input_chunks))
+	except InvalidSignature:
+		return False
+
+	return True
+
+def verify_ed448(key, signature, sig_input_chunks, digests):
+	if key.pubkey is None:
+		key.pubkey = ed448.Ed448PublicKey.from_public_bytes(key.eddsa_a)
+
+	try:
+		key.pubkey.verify(signature, b''.join(sig_input_chunks))
+	except InvalidSignature:
+		return False
+
+	return True
+
+##
+# Algorithm family name (for logging) and preconfigured
+# verification function for each supported algorithm
+##
+
+signature_verifiers = {
+	5:	('RSA',		functools.partial(verify_rsa, hashes.SHA1())),
+	7:	('RSA',		functools.partial(verify_rsa, hashes.SHA1())),
+	8:	('RSA',		functools.partial(verify_rsa, hashes.SHA256())),
+	10:	('RSA',		functools.partial(verify_rsa, hashes.SHA512())),
+	13:	('ECDSA',	functools.partial(verify_ecdsa, ec.SECP256R1(), hashes.SHA256(), 32)),
+	14:	('ECDSA',	functools.partial(verify_ecdsa, ec.SECP384R1(), hashes.SHA384(), 48)),
+	15:	('EdDSA',	verify_ed25519),
+	16:	('EdDSA',	verify_ed448)
+}
+
+##
+# Index the DNSKEY records in the supplied DNSKEY set by
+# key tag; returns a dictionary mapping each key tag to
+# a list of the DNSKEYs with that tag
+##
+
+def index_dnskeys(dnskeyset):
+	dnskeys_by_tag = dict()
+
+	for dnskey in dnskeyset:
+		if type(dnskey) is not oidnstypes.OI_DNSKEY_rec:
+			continue
+
+		dnskeys_by_tag.setdefault(dnskey.keytag(), []).append(dnskey)
+
+	return dnskeys_by_tag
+
 ##
 # Verify the supplied signature for the supplied RRset
-# using the supplied DNSKEY set
+# using the supplied DNSKEY set, indexed by key tag (see
+# index_dnskeys)
 ##
 
-def verify_sig(logger, rrset, dnskeyset, rrsig):
+def verify_sig(logger, rrset, dnskeys_by_tag, rrsig, wire_cache = None):
 	if type(rrsig) is not oidnstypes.OI_RRSIG_rec:
 		raise Exception("Can only verify RRSIG records")
 
@@ -77,120 +216,76 @@ def verify_sig(logger, rrset, dnskeyset, rrsig):
 		return False, "RRSIG has expired (timestamp {}, expiration {})".format(rrsig.timestamp, rrsig.expiration)
 
 	# Start by collecting DNSKEYs that match the RRSIG's key tag
-	matching_keys = []
-
-	for dnskey in dnskeyset:
-		if type(dnskey) is not oidnstypes.OI_DNSKEY_rec:
-			continue
-
-		if dnskey.keytag() == rrsig.keytag:
-			matching_keys.append(dnskey)
+	matching_keys = dnskeys_by_tag.get(rrsig.keytag, [])
 
 	if len(matching_keys) == 0:
-		logger.log_warn("Failed to find a DNSKEY with tag {} while validating signature over {} for {} (have keytag(s) {})".format(rrsig.keytag, rrset[0].fqdn, rrsig.type_covered,[k.keytag() for k in dnskeyset]))
+		logger.log_warn("Failed to find a DNSKEY with tag {} while validating signature over {} for {} (have keytag(s) {})".format(rrsig.keytag, rrset[0].fqdn, rrsig.type_covered, list(dnskeys_by_tag.keys())))
 		return False,"Failed to find a matching DNSKEY"
 
-	# Get the RRset in wire format first
-	wire_rrset = []
+	# Try the keys with the same algorithm as the RRSIG first,
+	# on a key tag collision these are most likely to validate
+	if len(matching_keys) > 1:
+		matching_keys = sorted(matching_keys, key=lambda k: k.algorithm != rrsig.algorithm)
 
-	for rec in rrset:
-		recwire = rec.towire()
-		wire = bytes()
-		wire += str_to_owner(rec.fqdn)
-		wire += bytes.fromhex('%04X' % rec.rectype)
-		wire += bytes.fromhex('0001') # Always use class IN
-		wire += bytes.fromhex('%08X' % rrsig.original_ttl)
-		wire += bytes.fromhex('%04X' % len(recwire))
+	# Get the RRset in canonical wire format first; if a cache
+	# is supplied, signatures with the same original TTL share
+	# the same wire format
+	wire_rrset = None
 
-		wire_rrset.append((wire, recwire))
+	if wire_cache is not None:
+		wire_rrset = wire_cache.get(rrsig.original_ttl, None)
 
-	# Canonically order the RRset
-	wire_rrset.sort(key=lambda x: x[1])
+	if wire_rrset is None:
+		wire_rrset = rrset_to_wire(rrset, rrsig.original_ttl)
 
-	# Construct the signature verification data
-	sig_input_data = bytes()
-	sig_input_data += rrsig.verification_data()
+		if wire_cache is not None:
+			wire_cache[rrsig.original_ttl] = wire_rrset
 
-	for wire,rdata in wire_rrset:
-		sig_input_data += wire
-		sig_input_data += rdata
+	# The signature verification data is the RRSIG RDATA
+	# followed by the RRset; it is kept in separate chunks
+	# rather than copied into one buffer, since RSA and ECDSA
+	# only need to stream it into a hash
+	sig_input_chunks = [ rrsig.verification_data(), wire_rrset ]
 
 	# Do the verification
 	verify_pass = False
 	reason = "Could not verify signature with any of the provided DNSKEYs [{}]".format(','.join(str(k.keytag()) for k in matching_keys))
 
+	# Digests of the signature verification data by hash
+	# algorithm, shared by all keys that match the key tag
+	digests = dict()
+
 	for key in matching_keys:
-		if key.algorithm in [ 5, 7, 8, 10 ]:
-			try:
-				# Perform RSA verification
-				rsakey = RSA.construct((key.rsa_n_int, key.rsa_e_int))
-				verifier = PKCS1_v1_5.new(rsakey)
-				hash_fn = None
-	
-				if key.algorithm in [ 5, 7 ]:
-					hash_fn = Crypto.Hash.SHA.new()
-				elif key.algorithm in [ 8 ]:
-					hash_fn = Crypto.Hash.SHA256.new()
-				elif key.algorithm in [ 10 ]:
-					hash_fn = Crypto.Hash.SHA512.new()
-	
-				hash_fn.update(sig_input_data)
-	
-				if verifier.verify(hash_fn, rrsig.signature):
-					verify_pass = True
-					reason = "Signature validated OK"
-					break
-				else:
-					logger.log_warn('Failed to validate RSA signature for {} (type {}) with DNSKEY with tag {}'.format(rrset[0].fqdn, rrsig.type_covered, key.keytag()))
-			except Exception as e:
-				logger.log_warn('Exception while validating RSA signature for {} (type {}) with DNSKEY with tag {} (e="{}")'.format(rrset[0].fqdn, rrsig.type_covered, key.keytag(), e))
-		elif key.algorithm in [ 13, 14 ]:
-			# Perform ECDSA verification
-			vk = None
-			hash_fn = None
-
-			try:
-				if key.algorithm == 13:
-					vk = ecdsa.VerifyingKey.from_string(key.wire, curve=ecdsa.NIST256p)
-					hash_fn = hashlib.sha256
-				elif key.algorithm == 14:
-					vk = ecdsa.VerifyingKey.from_string(key.wire, curve=ecdsa.NIST384p)
-					hash_fn = hashlib.sha384
-
-				if vk.verify(rrsig.signature, sig_input_data, hash_fn):
-					verify_pass = True
-					reason = "Signature validated OK"
-					break
-				else:
-					logger.log_warn('Failed to validate ECDSA signature for {} (type {}) with DNSKEY with tag {}'.format(rrset[0].fqdn, rrsig.type_covered, key.keytag()))
-			except Exception as e:
-				logger.log_warn('Exception while validating ECDSA signature for {} (type {}) with DNSKEY with tag {} (e="{}")'.format(rrset[0].fqdn, rrsig.type_covered, key.keytag(), e))
-		elif key.algorithm in [ 15 ]:
-			# Perform Ed25519 verification
-			try:
-				vk = nacl.signing.VerifyKey(key.eddsa_a, encoder=nacl.encoding.RawEncoder)
-
-				if vk.verify(sig_input_data, rrsig.signature, encoder=nacl.encoding.RawEncoder):
-					verify_pass = True
-					reason = "Signature validated OK"
-					break
-				else:
-					logger.log_warn('Failed to validate EdDSA signature for {} (type {}) with DNSKEY with tag {}'.format(rrset[0].fqdn, rrsig.type_covered, key.keytag()))
-			except Exception as e:
-				logger.log_warn('Exception while validating EdDSA signature for {} (type {}) with DNSKEY with tag {} (e="{}")'.format(rrset[0].fqdn, rrsig.type_covered, key.keytag(), e))
-		elif key.algorithm in [ 16 ]:
-			try:
-				ed448_schema = eddsa_rfc8032.eddsa_obj("Ed448")
-
-				if ed448_schema.verify(key.eddsa_a, sig_input_data, rrsig.signature):
-					verify_pass = True
-					reason = "Signature validated OK"
-					break
-				else:
-					logger.log_warn('Failed to validate EdDSA signature for {} (type {}) with DNSKEY with tag {}'.format(rrset[0].fqdn, rrsig.type_covered, key.keytag()))
-			except Exception as e:
-				logger.log_warn('Exception while validating EdDSA signature for {} (type {}) with DNSKEY with tag {} (e="{}")'.format(rrset[0].fqdn, rrsig.type_covered, key.keytag(), e))
-		else:
+		if key.algorithm not in signature_verifiers:
 			logger.log_warn('Skipped signature validation of {} record for {} because algorithm {} is not supported'.format(rrsig.type_covered, rrset[0].fqdn, key.algorithm))
+			continue
+
+		family, verifier = signature_verifiers[key.algorithm]
+
+		try:
+			if verifier(key, rrsig.signature, sig_input_chunks, digests):
+				verify_pass = True
+				reason = "Signature validated OK"
+				break
+			else:
+				logger.log_warn('Failed to validate {} signature for {} (type {}) with DNSKEY with tag {}'.format(family, rrset[0].fqdn, rrsig.type_covered, key.keytag()))
+		except Exception as e:
+			logger.log_warn('Exception while validating {} signature for {} (type {}) with DNSKEY with tag {} (e="{}")'.format(family, rrset[0].fqdn, rrsig.type_covered, key.keytag(), e))
 
 	return verify_pass, reason
+
+##
+# Verify all of the supplied signatures for the supplied
+# RRset using the supplied DNSKEY set, indexed by key tag
+# (see index_dnskeys); returns a list with a (verify_pass,
+# reason) tuple for every signature
+##
+
+def verify_sigs(logger, rrset, dnskeys_by_tag, rrsigs):
+	wire_cache = dict()
+	results = []
+
+	for rrsig in rrsigs:
+		results.append(verify_sig(logger, rrset, dnskeys_by_tag, rrsig, wire_cache))
+
+	return results
@@ -343,8 +343,16 @@ def main():
     cleanup_tmp_file('tlsa-all-{}-{}.txt'.format(sc.get_config_item('tld'), day))
     cleanup_tmp_file('tlsa-one-{}-{}.txt'.format(sc.get_config_item('tld'), day))
 
+    # A process count of 0 means: use all available cores
+    proc_count = sc.get_config_item('multi_process_count', 1)
+
+    if proc_count <= 0:
+        proc_count = mp.cpu_count()
+
+    logger.log_info('Using {} check process(es)'.format(proc_count))
+
     try:
-        process_avro_files(logger, day, sc.get_config_item('tmp_dir'), sc.get_config_item('multi_process_count', 1), sc.get_config_item('out_dir'), sc.get_config_item('tld'), tlsa_one_set, tlsa_all_set)
+        process_avro_files(logger, day, sc.get_config_item('tmp_dir'), proc_count, sc.get_config_item('out_dir'), sc.get_config_item('tld'), tlsa_one_set, tlsa_all_set)
     except Exception as e:
         logger.log_err('Process terminated with an exception')
         logger.log_err(e)
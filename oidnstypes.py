@@ -9,8 +9,17 @@
 import ipaddress
 import base64
 import base32hex
+import struct
 import dnssecfn
 
+##
+# Wire formats of the fixed-size parts of RDATA
+##
+
+dnskey_rdata_header	= struct.Struct('>HBB')		# flags, protocol, algorithm
+soa_rdata_trailer	= struct.Struct('>IIIII')	# serial, refresh, retry, expire, minimum
+rrsig_rdata_header	= struct.Struct('>HBBIIIH')	# type covered, algorithm, labels, original TTL, expiration, inception, key tag
+
 ##
 # Convert DNS record type string to integer value
 ##
@@ -69,6 +78,10 @@ class OI_DNS_rec:
 	fqdn		= None
 	timestamp	= 0
 	rectype		= 0
+	owner_wire	= None
+	prefix_wire	= None
+	rdata_wire	= None
+	rdlen_wire	= None
 
 	def __init__(self, fqdn, rectype):
 		self.fqdn	= fqdn
@@ -77,6 +90,36 @@ class OI_DNS_rec:
 	def set_timestamp(self, ts):
 		self.timestamp = int(ts / 1000)
 
+	# Canonical (lower case) owner name in wire format,
+	# computed once per record
+	def canonical_owner(self):
+		if self.owner_wire is None:
+			self.owner_wire = dnssecfn.str_to_owner(self.fqdn)
+
+		return self.owner_wire
+
+	# Canonical owner name, type and class (always IN) in
+	# wire format, computed once per record
+	def canonical_prefix(self):
+		if self.prefix_wire is None:
+			self.prefix_wire = self.canonical_owner() + self.rectype.to_bytes(2, 'big') + b'\x00\x01'
+
+		return self.prefix_wire
+
+	# RDATA in wire format, computed once per record
+	def canonical_rdata(self):
+		if self.rdata_wire is None:
+			self.rdata_wire = self.towire()
+
+		return self.rdata_wire
+
+	# RDATA length in wire format, computed once per record
+	def canonical_rdlength(self):
+		if self.rdlen_wire is None:
+			self.rdlen_wire = len(self.canonical_rdata()).to_bytes(2, 'big')
+
+		return self.rdlen_wire
+
 	def towire(self):
 		raise Exception("towire() not implemented for {}".format(type(self)))
 
@@ -283,6 +326,8 @@ class OI_DNSKEY_rec(OI_DNS_rec):
 	dsa_y		= None
 	eddsa_a		= None
 	wire		= None
+	pubkey		= None	# cached public key for signature validation
+	keytag_val	= None	# cached key tag
 
 	def __init__(self, fqdn, flags, protocol, algorithm, rsa_n, rsa_e, ecc_x, ecc_y, dsa_t, dsa_q, dsa_p, dsa_g, dsa_y, eddsa_a, wire):
 		if flags is None or protocol is None or algorithm is None:
@@ -334,22 +379,25 @@ class OI_DNSKEY_rec(OI_DNS_rec):
 		return self.tostr('DNSKEY')
 
 	def towire(self):
-		return bytes.fromhex('%04X%02X%02X' % (self.flags, self.protocol, self.algorithm)) + self.wire
+		return dnskey_rdata_header.pack(self.flags, self.protocol, self.algorithm) + self.wire
 
 	def keytag(self):
-		acc = int(0)
+		if self.keytag_val is not None:
+			return self.keytag_val
 
-		wire = self.towire()
+		wire = self.canonical_rdata()
 
-		for i in range(0, len(wire)):
-			if i & 1 == 1:
-				acc += wire[i]
-			else:
-				acc += wire[i] << 8
+		# RFC 4034, appendix B: bytes at even offsets are the
+		# high octet of each 16-bit word, bytes at odd offsets
+		# the low octet; summing the slices avoids a loop over
+		# every byte of the RDATA in Python
+		acc = (sum(wire[0::2]) << 8) + sum(wire[1::2])
 
 		acc += (acc >> 16) & 0xffff
 
-		return acc & 0xffff
+		self.keytag_val = acc & 0xffff
+
+		return self.keytag_val
 
 	def typestr(self):
 		return "DNSKEY"
@@ -459,12 +507,11 @@ class OI_SOA_rec(OI_DNS_rec):
 		return '{} IN SOA {} {} {} {} {} {} {}'.format(self.fqdn, self.mname, self.rname, self.serial, self.refresh, self.retry, self.expire, self.minimum)
 
 	def towire(self):
-		wire = bytes()
-		wire += dnssecfn.str_to_owner(self.mname)
-		wire += dnssecfn.str_to_owner(self.rname)
-		wire += bytes.fromhex('%08X%08X%08X%08X%08X' % (self.serial, self.refresh, self.retry, self.expire, self.minimum))
-
-		return wire
+		return b''.join([
+			dnssecfn.str_to_owner(self.mname),
+			dnssecfn.str_to_owner(self.rname),
+			soa_rdata_trailer.pack(self.serial, self.refresh, self.retry, self.expire, self.minimum)
+		])
 
 	def typestr(self):
 		return "SOA"
@@ -550,11 +597,7 @@ class OI_RRSIG_rec(OI_DNS_rec):
 		return '{} IN RRSIG {} {} {} {} {} {} {} {} {}'.format(self.fqdn, self.type_covered, self.algorithm, self.labels, self.original_ttl, self.expiration, self.inception, self.keytag, self.signer_name, base64.b64encode(self.signature).decode('utf8'))
 
 	def verification_data(self):
-		rdata = bytes()
-		rdata += bytes.fromhex("%04X%02X%02X%08X%08X%08X%04X" % (rectype_str_to_int(self.type_covered), self.algorithm, self.labels, self.original_ttl, self.expiration, self.inception, self.keytag))
-		rdata += dnssecfn.str_to_owner(self.signer_name)
-
-		return rdata
+		return rrsig_rdata_header.pack(rectype_str_to_int(self.type_covered), self.algorithm, self.labels, self.original_ttl, self.expiration, self.inception, self.keytag) + dnssecfn.str_to_owner(self.signer_name)
 
 	def typestr(self):
 		return "RRSIG"